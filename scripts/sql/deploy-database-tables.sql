@@ -38,6 +38,9 @@ CREATE SEQUENCE IF NOT EXISTS vendors_id_seq;
 SELECT setval('vendors_id_seq', COALESCE((SELECT MAX(id) FROM vendors), 1) + 1);
 ALTER TABLE vendors ALTER COLUMN id SET DEFAULT nextval('vendors_id_seq');
 
+-- Full-text search index used by the vendors list endpoint
+CREATE INDEX IF NOT EXISTS idx_vendors_search ON vendors USING GIN (to_tsvector('simple', name || ' ' || address || ' ' || contact_name || ' ' || contact_email || ' ' || type));
+
 /* END VENDORS */
 
 /* STATUS */
@@ -275,6 +278,13 @@ CREATE SEQUENCE IF NOT EXISTS invoices_id_seq;
 SELECT setval('invoices_id_seq', COALESCE((SELECT MAX(id) FROM invoices), 1) + 1);
 ALTER TABLE invoices ALTER COLUMN id SET DEFAULT nextval('invoices_id_seq');
 
+-- Indexes on the sortable invoice columns used by the invoices list endpoint, with id as the keyset pagination tiebreaker
+CREATE INDEX IF NOT EXISTS idx_invoices_vendor_id ON invoices (vendor_id, id);
+CREATE INDEX IF NOT EXISTS idx_invoices_number ON invoices (number, id);
+CREATE INDEX IF NOT EXISTS idx_invoices_amount ON invoices (amount, id);
+CREATE INDEX IF NOT EXISTS idx_invoices_invoice_date ON invoices (invoice_date, id);
+CREATE INDEX IF NOT EXISTS idx_invoices_payment_status ON invoices (payment_status, id);
+
 -- Invoice Line Items table
 CREATE TABLE IF NOT EXISTS invoice_line_items (
     id BIGSERIAL PRIMARY KEY,
@@ -0,0 +1,159 @@
+from fastapi import HTTPException
+from functools import lru_cache
+import base64
+import json
+
+def build_sort_lut(allowed: set):
+    """
+    Builds a lookup table from every accepted sortby value to its (column, direction).
+    Values may be 'column', 'column:direction' or 'column direction'.
+    """
+    lut = {}
+    for col in allowed:
+        lut[col] = (col, 'asc')
+        for dir in ('asc', 'desc'):
+            lut[f'{col}:{dir}'] = (col, dir)
+            lut[f'{col} {dir}'] = (col, dir)
+    return lut
+
+def parse_sortby(sortby: str, lut: dict, default: tuple = ('id', 'asc')):
+    """Looks up a sortby value in a lookup table built by build_sort_lut, returning the validated column and direction."""
+    if not sortby:
+        return default
+    sort = lut.get(sortby)
+    if sort is None:
+        # Fall back to normalizing the value, so directions in any case and extra whitespace are accepted
+        parts = sortby.replace(':', ' ').split()
+        sort = lut.get(' '.join(parts[:1] + [part.lower() for part in parts[1:]]))
+    if sort is None:
+        raise HTTPException(status_code=400, detail=f'Invalid sortby value "{sortby}".')
+    return sort
+
+def build_order_by(col: str, dir: str, alias: str = None):
+    """Builds the ORDER BY expression for a sort column, using id as a tiebreaker so the row order is deterministic."""
+    prefix = f'{alias}.' if alias else ''
+    if col == 'id':
+        return f'{prefix}id {dir}'
+    return f'{prefix}{col} {dir}, {prefix}id {dir}'
+
+def join_page_sql(sql: str, col: str, dir: str, join: tuple):
+    """
+    Wraps a page query so related rows are joined onto just the rows of the page, in the same round trip.
+    join is a (columns, joins) pair, where the joins refer to the page's rows by the alias page.
+    """
+    join_columns, joins = join
+    return f'SELECT page.*, {join_columns} FROM ({sql.rstrip(";")}) AS page {joins} ORDER BY {build_order_by(col, dir, "page")};'
+
+def build_count_sql(table: str, where: str = None):
+    """Builds the SQL statement to count the rows of a table."""
+    if where:
+        return f'SELECT COUNT(*) FROM {table} WHERE {where};'
+    return f'SELECT COUNT(*) FROM {table};'
+
+@lru_cache(maxsize=128)
+def build_list_sql(table: str, col: str, dir: str, where: str = None, paged: bool = True, columns: str = '*', join: tuple = None, counted: bool = True):
+    """
+    Builds the SQL statement to list the rows of a table, along with the total row count unless counted is False.
+    ORDER BY cannot be a bound parameter, so the validated column and direction are spliced into the SQL.
+    Statements are cached so the SQL text for each variant is stable, letting asyncpg reuse its prepared statements.
+    """
+    sql = f'SELECT {columns}, COUNT(*) OVER() AS __total FROM {table}' if counted else f'SELECT {columns} FROM {table}'
+    param = 1
+    if where:
+        # The where clause binds its value as $1
+        sql += f' WHERE {where}'
+        param = 2
+    sql += f' ORDER BY {build_order_by(col, dir)}'
+    if paged:
+        sql += f' LIMIT ${param} OFFSET ${param + 1}'
+    if join:
+        return join_page_sql(sql, col, dir, join)
+    return sql + ';'
+
+@lru_cache(maxsize=128)
+def build_keyset_sql(table: str, col: str, dir: str, where: str = None, columns: str = '*', join: tuple = None):
+    """
+    Builds the SQL statement to list the page of rows that follows a keyset pagination cursor.
+    The cursor's sort value and id are bound after the where clause value, followed by the limit.
+    """
+    op = '>' if dir == 'asc' else '<'
+    param = 2 if where else 1
+    if col == 'id':
+        after = f'id {op} ${param}'
+        param += 1
+    else:
+        after = f'({col}, id) {op} (${param}, ${param + 1})'
+        param += 2
+    conditions = f'{where} AND {after}' if where else after
+    sql = f'SELECT {columns} FROM {table} WHERE {conditions} ORDER BY {build_order_by(col, dir)} LIMIT ${param};'
+    if join:
+        return join_page_sql(sql, col, dir, join)
+    return sql
+
+def encode_cursor(record, col: str, dir: str, where_value = None, total: int = None):
+    """
+    Encodes the sort column and direction, the filter value, the sort value and id of the last row of a page,
+    and the total number of matching rows into an opaque keyset pagination cursor.
+    """
+    value = record[col]
+    if not isinstance(value, (int, str)):
+        # Decimal and date values are carried as strings and parsed back by the caller's column type
+        value = str(value)
+    payload = json.dumps([col, dir, where_value, value, record['id'], total])
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+def decode_cursor(cursor: str, col: str, dir: str, where_value, parse):
+    """
+    Decodes a keyset pagination cursor into the (sort value, id) to continue after, parsing the sort value with parse,
+    and the total number of matching rows counted for the first page.
+    The cursor must have been created for the same sort column, direction and filter value, or it would continue from the wrong position.
+    """
+    try:
+        cursor_col, cursor_dir, cursor_where_value, value, id, total = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if (cursor_col, cursor_dir, cursor_where_value) != (col, dir, where_value):
+            raise ValueError(f'Cursor was created for sort {cursor_col} {cursor_dir} and filter {cursor_where_value}.')
+        return (parse(value), int(id)), int(total)
+    except (ValueError, TypeError, ArithmeticError):
+        raise HTTPException(status_code=400, detail=f'Invalid cursor value "{cursor}".')
+
+async def fetch_list(conn, table: str, col: str, dir: str, skip: int, limit: int, where: str = None, where_value = None, columns: str = '*', join: tuple = None):
+    """
+    Fetches a page of rows from a table and the total number of matching rows in a single query.
+    A negative limit returns all rows. Rows are asyncpg records that also include a __total column.
+    Pass an explicit column list to avoid reading large columns the caller does not return,
+    and a join (see join_page_sql) to return related columns without a lookup per row.
+    """
+    paged = limit >= 0
+    args = [where_value] if where else []
+    page_args = args + [limit, skip] if paged else args
+    records = await conn.fetch(build_list_sql(table, col, dir, where, paged, columns, join), *page_args)
+
+    # The total row count is returned alongside each row by the COUNT(*) OVER() window.
+    # Records are returned as-is (with the extra __total column) to avoid copying every row into a dict.
+    total = records[0]['__total'] if records else 0
+
+    if paged and not records:
+        # The page is empty (past the end of the result set, or a limit of 0), so the window returned no rows to count
+        total = await conn.fetchval(build_count_sql(table, where), *args)
+
+    return records, total
+
+async def fetch_keyset_page(conn, table: str, col: str, dir: str, after: tuple, limit: int, where: str = None, where_value = None, columns: str = '*', join: tuple = None):
+    """
+    Fetches the page of rows that follows the (sort value, id) of a keyset pagination cursor.
+    Unlike OFFSET, the page is read directly from its position in the (col, id) index, so the cost does not grow with page depth.
+    The rows are not counted, since that would read every matching row; the total counted for the first page is carried in the cursor.
+    """
+    args = [where_value] if where else []
+    after_args = [after[1]] if col == 'id' else list(after)
+    return await conn.fetch(build_keyset_sql(table, col, dir, where, columns, join), *args, *after_args, limit)
+
+async def fetch_large_page(conn, table: str, col: str, dir: str, skip: int, limit: int, where: str = None, where_value = None, columns: str = '*', join: tuple = None):
+    """
+    Fetches a large page of rows, counting the total number of matching rows with a separate query.
+    Without a COUNT(*) OVER() window, PostgreSQL can stop once the page is full, by walking a sort index or keeping a bounded top-N sort.
+    """
+    args = [where_value] if where else []
+    records = await conn.fetch(build_list_sql(table, col, dir, where, True, columns, join, False), *args, limit, skip)
+    total = await conn.fetchval(build_count_sql(table, where), *args)
+    return records, total
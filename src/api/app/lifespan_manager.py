@@ -9,6 +9,13 @@ from app.services import (
 from azure.identity.aio import DefaultAzureCredential
 from azure.core.credentials import AzureKeyCredential
 from contextlib import asynccontextmanager
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.inmemory import InMemoryBackend
+from fastapi_cache.backends.redis import RedisBackend
+from redis import asyncio as aioredis
+import logging
+
+logger = logging.getLogger(__name__)
 
 # Create a global async Azure OpenAI
 aoai_service = None
@@ -24,6 +31,22 @@ storage_service = None
 doc_intelligence_service = None
 # Create a global PromptService
 prompt_service = None
+# Create a global async Redis client for the response cache
+redis_client = None
+
+def request_key_builder(func, namespace: str = "", *, request = None, response = None, args = (), kwargs = None):
+    """Builds response cache keys from the request path and query string, so cached entries are shared across worker processes."""
+    return f"{namespace}:{request.url.path}?{request.url.query}"
+
+async def clear_response_cache(namespace: str):
+    """
+    Clears the cached responses in a namespace after a write. The write has already been saved, so a cache
+    that cannot be reached is logged rather than failing the request, as the cache decorator does for reads.
+    """
+    try:
+        await FastAPICache.clear(namespace=namespace)
+    except Exception:
+        logger.warning(f"Error clearing response cache namespace '{namespace}':", exc_info=True)
 
 @asynccontextmanager
 async def lifespan(app):
@@ -35,6 +58,7 @@ async def lifespan(app):
     global doc_intelligence_service
     global storage_service
     global prompt_service
+    global redis_client
     
     # Create an async Microsoft Entra ID RBAC credential
     credential = DefaultAzureCredential()
@@ -53,13 +77,26 @@ async def lifespan(app):
     storage_service = StorageService(credential, await config_service.get_storage_account(), config_service.get_document_container_name())
 
     # Create a connection to the Azure Database for PostgreSQL server
-    db = DatabaseService(credential, await config_service.get_postgresql_server_name(), await config_service.get_postgresql_database_name())
+    db = DatabaseService(credential, await config_service.get_postgresql_server_name(), await config_service.get_postgresql_database_name(), await config_service.get_postgresql_port())
 
     # Create a prompt service
     prompt_service = PromptService()
 
+    # Initialize the response cache for idempotent GET endpoints. Writes clear the cache, which only reaches
+    # every worker process when the cache is shared, so caching is only enabled when Redis is configured.
+    redis_url = await config_service.get_redis_url()
+    if redis_url:
+        redis_client = aioredis.from_url(redis_url)
+        FastAPICache.init(RedisBackend(redis_client), prefix="bycop", key_builder=request_key_builder)
+    else:
+        FastAPICache.init(InMemoryBackend(), prefix="bycop", key_builder=request_key_builder, enable=False)
+
     yield
 
+    # Close the Redis client
+    if redis_client is not None:
+        await redis_client.close()
+
     # Close the database connection
     await db.close()
 
@@ -1,6 +1,9 @@
 from dotenv import load_dotenv
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi_cache import FastAPICache
+from starlette.datastructures import MutableHeaders
 from app.lifespan_manager import lifespan
 from app.routers import (
     completions,
@@ -28,17 +31,47 @@ app = FastAPI(
     summary="Woodgrove Bank API for the Build Your Own Copilot with Azure Database for PostgreSQL Solution Accelerator",
     version="1.0.0",
     docs_url="/swagger",
-    openapi_url="/swagger/v1/swagger.json"
+    openapi_url="/swagger/v1/swagger.json",
+    default_response_class=ORJSONResponse
 )
 
+# CORS is required for the User Portal, which calls the API from the browser on a different origin.
+# Requests without an Origin header (service-to-service traffic) pass straight through the middleware,
+# and preflight responses are cached by the browser for 2 hours to avoid repeated OPTIONS requests.
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    max_age=7200
 )
 
+class RevalidateCachedResponsesMiddleware:
+    """
+    Replaces the max-age the response cache sets on cached responses with no-cache, so browsers check back
+    with the API rather than serving an invoice that has since been updated or deleted.
+    Only the response start message is edited, and requests pass straight through while the cache is disabled.
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not FastAPICache.get_enable():
+            await self.app(scope, receive, send)
+            return
+
+        async def send_no_cache(message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                if "X-FastAPI-Cache" in headers:
+                    headers["Cache-Control"] = "no-cache"
+            await send(message)
+
+        await self.app(scope, receive, send_no_cache)
+
+app.add_middleware(RevalidateCachedResponsesMiddleware)
+
 # Add routers to API endpoints
 app.include_router(deliverables.router)
 app.include_router(documents.router)
@@ -58,6 +91,10 @@ async def get():
     """API welcome message."""
     return {"message": "Welcome to the Woodgrove Bank API!"}
 
+# Pydantic compiles each model's validators when its class is defined, but FastAPI builds the
+# OpenAPI schema for every route lazily on the first Swagger request; build it now instead.
+app.openapi()
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="127.0.0.1", port=8000, log_level="info")
\ No newline at end of file
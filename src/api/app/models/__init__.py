@@ -3,7 +3,7 @@ from .analyze_result import InvoiceAnalyzeResult, SowAnalyzeResult
 from .completion_request import CompletionRequest
 from .completion_response import CompletionResponse
 from .deliverable import Deliverable, DeliverableEdit
-from .invoice import Invoice, InvoiceEdit
+from .invoice import Invoice, InvoiceEdit, InvoiceListItem, InvoiceListResponse
 from .invoice_line_item import InvoiceLineItem, InvoiceLineItemEdit
 from .list_response import ListResponse
 from .milestone import Milestone, MilestoneEdit
@@ -1,3 +1,4 @@
+from .list_response import ListResponse
 from pydantic import BaseModel, Json, Field
 from typing import List, Optional
 from datetime import date
@@ -14,3 +15,10 @@ class InvoiceEdit(BaseModel):
 
 class Invoice(InvoiceEdit):
     id: int
+
+class InvoiceListItem(Invoice):
+    vendor_name: Optional[str] = None
+    sow_number: Optional[str] = None
+
+class InvoiceListResponse(ListResponse[InvoiceListItem]):
+    next_cursor: Optional[str] = None
\ No newline at end of file
@@ -1,5 +1,5 @@
 from app.models import Invoice, Sow, Milestone, Deliverable, InvoiceLineItem, Vendor
-from pydantic import parse_obj_as, BaseModel
+from pydantic import BaseModel
 from typing import Optional
 
 class InvoiceModel(Invoice):
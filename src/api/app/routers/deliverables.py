@@ -1,8 +1,8 @@
+from app.functions.list_queries import build_sort_lut, parse_sortby, fetch_list
 from app.lifespan_manager import get_db_connection_pool
 from app.models import Deliverable, DeliverableEdit, ListResponse
 from fastapi import APIRouter, Depends, HTTPException, Form
 from datetime import datetime
-from pydantic import parse_obj_as
 
 # Initialize the router
 router = APIRouter(
@@ -12,33 +12,22 @@ router = APIRouter(
     responses = {404: {"description": "Not found"}}
 )
 
+# Accepted sortby values for the list of deliverables, mapped to their (column, direction)
+DELIVERABLE_SORT_LUT = build_sort_lut({"id", "milestone_id", "description", "amount", "status", "due_date"})
+
 @router.get("/", response_model=ListResponse[Deliverable])
 async def list_deliverables(milestone_id: int = -1, skip: int = 0, limit: int = 10, sortby: str = None, pool = Depends(get_db_connection_pool)):
     """Retrieves a list of deliverables from the database."""
-    async with pool.acquire() as conn:
-        orderby = 'id'
-        if (sortby):
-            orderby = sortby
+    col, dir = parse_sortby(sortby, DELIVERABLE_SORT_LUT)
 
-        if limit == -1:
-            if milestone_id == -1:
-                rows = await conn.fetch('SELECT * FROM deliverables ORDER BY $1;', orderby)
-            else:
-                rows = await conn.fetch('SELECT * FROM deliverables WHERE milestone_id = $1 ORDER BY $2;', milestone_id, orderby)
-        else:
-            if milestone_id == -1:
-                rows = await conn.fetch('SELECT * FROM deliverables ORDER BY $1 LIMIT $2 OFFSET $3;', orderby, limit, skip)
-            else:
-                rows = await conn.fetch('SELECT * FROM deliverables WHERE milestone_id = $1 ORDER BY $2 LIMIT $3 OFFSET $4;', milestone_id, orderby, limit, skip)
-        
-        deliverables = parse_obj_as(list[Deliverable], [dict(row) for row in rows])
-
-        if (milestone_id == -1):
-            total = await conn.fetchval('SELECT COUNT(*) FROM deliverables;')
+    async with pool.acquire() as conn:
+        if milestone_id == -1:
+            records, total = await fetch_list(conn, 'deliverables', col, dir, skip, limit)
         else:
-            total = await conn.fetchval('SELECT COUNT(*) FROM deliverables WHERE milestone_id = $1;', milestone_id)
+            records, total = await fetch_list(conn, 'deliverables', col, dir, skip, limit, 'milestone_id = $1', milestone_id)
+        deliverables = [Deliverable.model_validate(dict(record)) for record in records]
 
-    if (limit == -1):
+    if (limit < 0):
         limit = total
 
     return ListResponse[Deliverable](data=deliverables, total = total, skip = skip, limit = limit)
@@ -50,7 +39,7 @@ async def get_by_id(deliverable_id: int, pool = Depends(get_db_connection_pool))
         row = await conn.fetchrow('SELECT * FROM deliverables WHERE id = $1;', deliverable_id)
         if row is None:
             raise HTTPException(status_code=404, detail=f'A deliverable with an id of {deliverable_id} was not found.')
-        deliverable = parse_obj_as(Deliverable, dict(row))
+        deliverable = Deliverable.model_validate(dict(row))
     return deliverable
 
 @router.post("/", response_model=Deliverable)
@@ -71,7 +60,7 @@ async def create_deliverable(
         VALUES ($1, $2, $3, $4, $5) RETURNING id;
         ''', milestone_id, description, amount, status, parsed_due_date)
         row = await conn.fetchrow('SELECT * FROM deliverables WHERE id = $1;', deliverable_id)
-        deliverable = parse_obj_as(Deliverable, dict(row))
+        deliverable = Deliverable.model_validate(dict(row))
     return deliverable
 
 @router.put("/{deliverable_id}", response_model=Deliverable)
@@ -89,7 +78,7 @@ async def update_deliverable(
         ''', deliverable.description, deliverable.amount, deliverable.status, deliverable.due_date, deliverable_id)
 
         row = await conn.fetchrow('SELECT * FROM deliverables WHERE id = $1;', deliverable_id)
-        deliverable = parse_obj_as(Deliverable, dict(row))
+        deliverable = Deliverable.model_validate(dict(row))
     return deliverable
 
 @router.delete("/{deliverable_id}")
@@ -98,7 +87,7 @@ async def delete_deliverable(deliverable_id: int, pool = Depends(get_db_connecti
         row = await conn.fetchrow('SELECT * FROM deliverables WHERE id = $1;', deliverable_id)
         if row is None:
             raise HTTPException(status_code=404, detail=f'A deliverable with an id of {deliverable_id} was not found.')
-        deliverable = parse_obj_as(Deliverable, dict(row))
+        deliverable = Deliverable.model_validate(dict(row))
 
         await conn.execute('DELETE FROM deliverables WHERE id = $1;', deliverable_id)
     return deliverable
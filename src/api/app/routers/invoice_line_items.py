@@ -1,8 +1,8 @@
+from app.functions.list_queries import build_sort_lut, parse_sortby, fetch_list
 from app.lifespan_manager import get_db_connection_pool
 from app.models import InvoiceLineItem, InvoiceLineItemEdit, ListResponse
 from fastapi import APIRouter, Depends, HTTPException, Form
 from datetime import datetime
-from pydantic import parse_obj_as
 
 # Initialize the router
 router = APIRouter(
@@ -12,33 +12,22 @@ router = APIRouter(
     responses = {404: {"description": "Not found"}}
 )
 
+# Accepted sortby values for the list of invoice line items, mapped to their (column, direction)
+INVOICE_LINE_ITEM_SORT_LUT = build_sort_lut({"id", "invoice_id", "description", "amount", "status", "due_date"})
+
 @router.get("/", response_model=ListResponse[InvoiceLineItem])
 async def list_invoice_line_items(invoice_id: int = -1, skip: int = 0, limit: int = 10, sortby: str = None, pool = Depends(get_db_connection_pool)):
     """Retrieves a list of invoice_line_items from the database."""
-    orderby = 'id'
-    if (sortby):
-        orderby = sortby
+    col, dir = parse_sortby(sortby, INVOICE_LINE_ITEM_SORT_LUT)
 
     async with pool.acquire() as conn:
-        if limit == -1:
-            if invoice_id == -1:
-                rows = await conn.fetch('SELECT * FROM invoice_line_items ORDER BY $1;', orderby)
-            else:
-                rows = await conn.fetch('SELECT * FROM invoice_line_items WHERE invoice_id = $1 ORDER BY $2;', invoice_id, orderby)
-        else:
-            if invoice_id == -1:
-                rows = await conn.fetch('SELECT * FROM invoice_line_items ORDER BY $1 LIMIT $2 OFFSET $3;', orderby, limit, skip)
-            else:
-                rows = await conn.fetch('SELECT * FROM invoice_line_items WHERE invoice_id = $1 ORDER BY $2 LIMIT $3 OFFSET $4;', invoice_id, orderby, limit, skip)
-
-        items = parse_obj_as(list[InvoiceLineItem], [dict(row) for row in rows])
-
-        if (invoice_id == -1):
-            total = await conn.fetchval('SELECT COUNT(*) FROM invoice_line_items;')
+        if invoice_id == -1:
+            records, total = await fetch_list(conn, 'invoice_line_items', col, dir, skip, limit)
         else:
-            total = await conn.fetchval('SELECT COUNT(*) FROM invoice_line_items WHERE invoice_id = $1;', invoice_id)
+            records, total = await fetch_list(conn, 'invoice_line_items', col, dir, skip, limit, 'invoice_id = $1', invoice_id)
+        items = [InvoiceLineItem.model_validate(dict(record)) for record in records]
 
-    if (limit == -1):
+    if (limit < 0):
         limit = total
 
     return ListResponse[InvoiceLineItem](data=items, total = total, skip = skip, limit = limit)
@@ -50,7 +39,7 @@ async def get_by_id(id: int, pool = Depends(get_db_connection_pool)):
         row = await conn.fetchrow('SELECT * FROM invoice_line_items WHERE id = $1;', id)
         if row is None:
             raise HTTPException(status_code=404, detail=f'A invoice_line_item with an id of {id} was not found.')
-        item = parse_obj_as(InvoiceLineItem, dict(row))
+        item = InvoiceLineItem.model_validate(dict(row))
     return item
 
 @router.post("/", response_model=InvoiceLineItem)
@@ -76,7 +65,7 @@ async def create(
             RETURNING id;
         ''', invoice_id, description, amount, status, due_date_parsed)
         row = await conn.fetchrow('SELECT * FROM invoice_line_items WHERE id = $1;', id)
-        milestone = parse_obj_as(InvoiceLineItem, dict(row))
+        milestone = InvoiceLineItem.model_validate(dict(row))
     return milestone
 
 @router.put("/{id}", response_model=InvoiceLineItem)
@@ -88,7 +77,7 @@ async def update(id: int, item: InvoiceLineItemEdit, pool = Depends(get_db_conne
             WHERE id = $6;
         ''', item.invoice_id, item.description, item.amount, item.status, item.due_date, id)
         row = await conn.fetchrow('SELECT * FROM invoice_line_items WHERE id = $1;', id)
-        milestone = parse_obj_as(InvoiceLineItem, dict(row))
+        milestone = InvoiceLineItem.model_validate(dict(row))
     return milestone
 
 @router.delete("/{id}", response_model=InvoiceLineItem)
@@ -98,5 +87,5 @@ async def delete(id: int, pool = Depends(get_db_connection_pool)):
         if row is None:
             raise HTTPException(status_code=404, detail=f'A invoice_line_item with an id of {id} was not found.')
         await conn.execute('DELETE FROM invoice_line_items WHERE id = $1;', id)
-        item = parse_obj_as(InvoiceLineItem, dict(row))
+        item = InvoiceLineItem.model_validate(dict(row))
     return item
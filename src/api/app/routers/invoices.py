@@ -1,9 +1,14 @@
-from app.lifespan_manager import get_db_connection_pool, get_storage_service, get_azure_doc_intelligence_service
-from app.models import Invoice, InvoiceEdit, ListResponse, InvoiceAnalyzeResult
+from app.functions.list_queries import build_sort_lut, parse_sortby, fetch_list, fetch_large_page, fetch_keyset_page, encode_cursor, decode_cursor
+from app.lifespan_manager import clear_response_cache, get_db_connection_pool, get_storage_service, get_azure_doc_intelligence_service
+from app.models import Invoice, InvoiceEdit, InvoiceListResponse, InvoiceAnalyzeResult
 from fastapi import APIRouter, Depends, HTTPException, File, UploadFile, Form
-from datetime import datetime
-from pydantic import parse_obj_as
+from fastapi.responses import ORJSONResponse
+from fastapi_cache.decorator import cache
+from datetime import date, datetime
+from decimal import Decimal
+import asyncio
 import json
+import orjson
 import traceback
 
 # Initialize the router
@@ -14,47 +19,113 @@ router = APIRouter(
     responses = {404: {"description": "Not found"}}
 )
 
-@router.get("/", response_model=ListResponse[Invoice])
-async def list_invoices(vendor_id: int = -1, skip: int = 0, limit: int = 10, sortby: str = None, pool = Depends(get_db_connection_pool)):
-    """Retrieves a list of invoices from the database."""
-    async with pool.acquire() as conn:
-        orderby = 'id'
-        if (sortby):
-            orderby = sortby
-
-        if limit < 0:
-            if vendor_id > 0:
-                rows = await conn.fetch('SELECT * FROM invoices WHERE vendor_id = $1 ORDER BY $2;', vendor_id, orderby)
-            else:
-                rows = await conn.fetch('SELECT * FROM invoices ORDER BY $1;', orderby)
-        else:
-            if vendor_id > 0:
-                rows = await conn.fetch('SELECT * FROM invoices WHERE vendor_id = $1 ORDER BY $2 LIMIT $3 OFFSET $4;', vendor_id, orderby, limit, skip)
-            else:
-                rows = await conn.fetch('SELECT * FROM invoices ORDER BY $1 LIMIT $2 OFFSET $3;', orderby, limit, skip)
+# Accepted sortby values for the list of invoices, mapped to their (column, direction)
+INVOICE_SORT_LUT = build_sort_lut({"id", "number", "vendor_id", "sow_id", "amount", "invoice_date", "payment_status"})
+
+# Parsers for the sort values carried in keyset pagination cursors
+INVOICE_SORT_TYPES = {
+    "id": int,
+    "number": str,
+    "vendor_id": int,
+    "sow_id": int,
+    "amount": Decimal,
+    "invoice_date": date.fromisoformat,
+    "payment_status": str
+}
+
+# Columns returned by the list of invoices; excludes the large content column, so its TOAST data is never read
+INVOICE_LIST_COLUMNS = 'id, vendor_id, sow_id, number, amount, invoice_date, payment_status, document, metadata'
+
+# Vendor name and SOW number joined onto each page of invoices, so clients do not look them up per invoice
+INVOICE_LIST_JOIN = (
+    'vendors.name AS vendor_name, sows.number AS sow_number',
+    'LEFT JOIN vendors ON vendors.id = page.vendor_id LEFT JOIN sows ON sows.id = page.sow_id'
+)
 
-        invoices = parse_obj_as(list[Invoice], [dict(row) for row in rows])
+# Page size above which the total number of invoices is counted with a separate query
+INVOICE_LIST_LARGE_PAGE_ROWS = 100
+
+# Number of rows (roughly 1 MB of JSON, at about 200 bytes per row) above which the list response is built on a worker thread
+INVOICE_LIST_THREAD_ROWS = 5000
+
+def serialize_invoice(record):
+    """Converts an invoice list row into a JSON-ready dict matching the InvoiceListItem model, without a Pydantic round trip."""
+    metadata = record['metadata']
+    return {
+        'vendor_id': record['vendor_id'],
+        'sow_id': record['sow_id'],
+        'number': record['number'],
+        'amount': float(record['amount']),
+        'invoice_date': record['invoice_date'],
+        'payment_status': record['payment_status'],
+        'document': record['document'],
+        # jsonb is returned as JSON text, so it is embedded as-is rather than parsed and re-encoded
+        'metadata': orjson.Fragment(metadata) if metadata is not None else None,
+        'id': record['id'],
+        'vendor_name': record['vendor_name'],
+        'sow_number': record['sow_number']
+    }
+
+def serialize_invoice_list(records, total: int, skip: int, limit: int, next_cursor: str):
+    """Builds the list of invoices response body, matching the InvoiceListResponse model, from invoice list rows."""
+    return {
+        'data': [serialize_invoice(record) for record in records],
+        'total': total,
+        'skip': skip,
+        'limit': limit,
+        'next_cursor': next_cursor
+    }
+
+@router.get("/", responses={200: {"model": InvoiceListResponse}})
+@cache(expire=30, namespace="invoices")
+async def list_invoices(vendor_id: int = -1, skip: int = 0, limit: int = 10, sortby: str = None, cursor: str = None, pool = Depends(get_db_connection_pool)):
+    """
+    Retrieves a list of invoices from the database.
+    Pass the next_cursor of the previous page as cursor to read the next page by keyset instead of skipping rows with OFFSET;
+    skip is not used with a cursor, and is returned as 0. The total is counted for the first page and carried in the cursor,
+    so on later pages it is a snapshot from when the first page was read.
+    """
+    col, dir = parse_sortby(sortby, INVOICE_SORT_LUT)
+    where, where_value = ('vendor_id = $1', vendor_id) if vendor_id > 0 else (None, None)
 
-        if (vendor_id > 0):
-            total = await conn.fetchval('SELECT COUNT(*) FROM invoices WHERE vendor_id = $1;', vendor_id)
+    async with pool.acquire() as conn:
+        if cursor and limit >= 0:
+            after, total = decode_cursor(cursor, col, dir, where_value, INVOICE_SORT_TYPES[col])
+            skip = 0
+            records = await fetch_keyset_page(conn, 'invoices', col, dir, after, limit, where, where_value, columns=INVOICE_LIST_COLUMNS, join=INVOICE_LIST_JOIN)
+        elif limit > INVOICE_LIST_LARGE_PAGE_ROWS:
+            records, total = await fetch_large_page(conn, 'invoices', col, dir, skip, limit, where, where_value, columns=INVOICE_LIST_COLUMNS, join=INVOICE_LIST_JOIN)
         else:
-            total = await conn.fetchval('SELECT COUNT(*) FROM invoices;')
+            records, total = await fetch_list(conn, 'invoices', col, dir, skip, limit, where, where_value, columns=INVOICE_LIST_COLUMNS, join=INVOICE_LIST_JOIN)
+
+    # A full page may be followed by more rows, so return a cursor positioned after its last row
+    next_cursor = encode_cursor(records[-1], col, dir, where_value, total) if records and len(records) == limit else None
 
     if (limit <= -1):
         limit = total
-        
-    return ListResponse(data=invoices, total = total, skip = skip, limit = limit)
+
+    # Rows are serialized directly by orjson, skipping Pydantic validation on this hot list path
+    if len(records) > INVOICE_LIST_THREAD_ROWS:
+        # Building a large page row by row would hold the event loop for its whole duration. On a worker thread,
+        # the interpreter switches back to the event loop between rows. The encoded JSON is wrapped in a Fragment,
+        # which ORJSONResponse writes out as-is.
+        payload = await asyncio.to_thread(lambda: orjson.dumps(serialize_invoice_list(records, total, skip, limit, next_cursor)))
+        return ORJSONResponse(orjson.Fragment(payload))
+    return ORJSONResponse(serialize_invoice_list(records, total, skip, limit, next_cursor))
 
    
-@router.get("/{invoice_id}", response_model=Invoice)
+@router.get("/{invoice_id}", responses={200: {"model": Invoice}})
+@cache(expire=30, namespace="invoices")
 async def get_by_id(invoice_id: int, pool = Depends(get_db_connection_pool)):
     """Retrieves an invoice by ID from the database."""
     async with pool.acquire() as conn:
         row = await conn.fetchrow('SELECT * FROM invoices WHERE id = $1;', invoice_id)
         if row is None:
             raise HTTPException(status_code=404, detail=f'An invoice with an id of {invoice_id} was not found.')
-        invoice = parse_obj_as(Invoice, dict(row))
-    return invoice
+        invoice = Invoice.model_validate(dict(row))
+    # The cache stores the JSON body, and hits are returned as the decoded dict. Returning the JSON
+    # directly, rather than through response_model, keeps metadata (Json[dict]) from being re-validated as a JSON string.
+    return ORJSONResponse(invoice.model_dump(mode="json"))
 
 
 @router.post("/", response_model=InvoiceAnalyzeResult)
@@ -141,7 +212,7 @@ async def analyze_invoice(
             if row is None:
                 raise HTTPException(status_code=500, detail=f'An error occurred while creating the Invoice.')
 
-            invoice = parse_obj_as(Invoice, dict(row))
+            invoice = Invoice.model_validate(dict(row))
 
             # Save Invoice Line Items
             await conn.execute('''DELETE FROM invoice_line_items WHERE invoice_id = $1''', invoice.id)
@@ -150,6 +221,9 @@ async def analyze_invoice(
                     INSERT INTO invoice_line_items (invoice_id, description, amount, status, due_date) VALUES ($1, $2, $3, $4, $5);
                 ''', invoice.id, line_item.description, line_item.amount, line_item.status, line_item.due_date)
 
+        # Invalidate cached invoice responses
+        await clear_response_cache("invoices")
+
         return InvoiceAnalyzeResult(hasError=False, error=None, message="Invoice analyzed successfully.", invoice=invoice)
 
     except Exception as e:
@@ -161,9 +235,12 @@ async def analyze_invoice(
 async def update_invoice(invoice_id: int, invoice_update: InvoiceEdit, pool = Depends(get_db_connection_pool)):
     """Updates an invoice in the database."""
 
-    invoice = await get_by_id(invoice_id, pool)
-    if invoice is None:
+    # Read the current invoice directly, rather than through the cached get_by_id endpoint
+    async with pool.acquire() as conn:
+        row = await conn.fetchrow('SELECT * FROM invoices WHERE id = $1;', invoice_id)
+    if row is None:
         raise HTTPException(status_code=404, detail=f'An invoice with an id of {invoice_id} was not found.')
+    invoice = Invoice.model_validate(dict(row))
 
     invoice.vendor_id = invoice_update.vendor_id
     invoice.sow_id = invoice_update.sow_id
@@ -180,7 +257,10 @@ async def update_invoice(invoice_id: int, invoice_update: InvoiceEdit, pool = De
         RETURNING *;
         ''', invoice.number, invoice.amount, invoice.invoice_date, invoice.payment_status, invoice.vendor_id, invoice.sow_id, invoice_id)
         
-        updated_invoice = parse_obj_as(Invoice, dict(row))
+        updated_invoice = Invoice.model_validate(dict(row))
+
+    # Invalidate cached invoice responses
+    await clear_response_cache("invoices")
     return updated_invoice
 
 @router.delete("/{invoice_id}", response_model=Invoice)
@@ -190,11 +270,14 @@ async def delete_invoice(invoice_id: int, pool = Depends(get_db_connection_pool)
         row = await conn.fetchrow('SELECT * FROM invoices WHERE id = $1;', invoice_id)
         if row is None:
             raise HTTPException(status_code=404, detail=f'A invoice with an id of {id} was not found.')
-        invoice = parse_obj_as(Invoice, dict(row))
+        invoice = Invoice.model_validate(dict(row))
 
         # Delete file from Azure Blob Storage
         await storage_service.delete_document(invoice.document)
 
         # Delete invoice from the database
         await conn.execute('DELETE FROM invoices WHERE id = $1;', invoice_id)
+
+    # Invalidate cached invoice responses
+    await clear_response_cache("invoices")
     return invoice
\ No newline at end of file
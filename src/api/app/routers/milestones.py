@@ -1,7 +1,7 @@
+from app.functions.list_queries import build_sort_lut, parse_sortby, fetch_list
 from app.lifespan_manager import get_db_connection_pool
 from app.models import Milestone, MilestoneEdit, ListResponse
 from fastapi import APIRouter, Depends, HTTPException, Form
-from pydantic import parse_obj_as
 
 # Initialize the router
 router = APIRouter(
@@ -11,33 +11,22 @@ router = APIRouter(
     responses = {404: {"description": "Not found"}}
 )
 
+# Accepted sortby values for the list of milestones, mapped to their (column, direction)
+MILESTONE_SORT_LUT = build_sort_lut({"id", "sow_id", "name", "status"})
+
 @router.get("/", response_model=ListResponse[Milestone])
 async def list_milestones(sow_id: int = -1, skip: int = 0, limit: int = 10, sortby: str = None, pool = Depends(get_db_connection_pool)):
     """Retrieves a list of milestones from the database."""
-    async with pool.acquire() as conn:
-        orderby = 'id'
-        if (sortby):
-            orderby = sortby
-
-        if limit == -1:
-            if sow_id == -1:
-                rows = await conn.fetch('SELECT * FROM milestones ORDER BY $1;', orderby)
-            else:
-                rows = await conn.fetch('SELECT * FROM milestones WHERE sow_id = $1 ORDER BY $2;', sow_id, orderby)
-        else:
-            if sow_id == -1:
-                rows = await conn.fetch('SELECT * FROM milestones ORDER BY $1 LIMIT $2 OFFSET $3;', orderby, limit, skip)
-            else:
-                rows = await conn.fetch('SELECT * FROM milestones WHERE sow_id = $1 ORDER BY $2 LIMIT $3 OFFSET $4;', sow_id, orderby, limit, skip)
-
-        milestones = parse_obj_as(list[Milestone], [dict(row) for row in rows])
+    col, dir = parse_sortby(sortby, MILESTONE_SORT_LUT)
 
-        if (sow_id == -1):
-            total = await conn.fetchval('SELECT COUNT(*) FROM milestones;')
+    async with pool.acquire() as conn:
+        if sow_id == -1:
+            records, total = await fetch_list(conn, 'milestones', col, dir, skip, limit)
         else:
-            total = await conn.fetchval('SELECT COUNT(*) FROM milestones WHERE sow_id = $1;', sow_id)
+            records, total = await fetch_list(conn, 'milestones', col, dir, skip, limit, 'sow_id = $1', sow_id)
+        milestones = [Milestone.model_validate(dict(record)) for record in records]
 
-    if (limit == -1):
+    if (limit < 0):
         limit = total
 
     return ListResponse[Milestone](data=milestones, total = total, skip = skip, limit = limit)
@@ -49,7 +38,7 @@ async def get_by_id(milestone_id: int, pool = Depends(get_db_connection_pool)):
         row = await conn.fetchrow('SELECT * FROM milestones WHERE id = $1;', milestone_id)
         if row is None:
             raise HTTPException(status_code=404, detail=f'A milestone with an id of {milestone_id} was not found.')
-        milestone = parse_obj_as(Milestone, dict(row))
+        milestone = Milestone.model_validate(dict(row))
     return milestone
 
 @router.post("/", response_model=Milestone)
@@ -63,7 +52,7 @@ async def create_milestone(
     async with pool.acquire() as conn:
         milestone_id = await conn.fetchval('INSERT INTO milestones (sow_id, name, status) VALUES ($1, $2, $3) RETURNING id;', sow_id, name, status)
         row = await conn.fetchrow('SELECT * FROM milestones WHERE id = $1;', milestone_id)
-        milestone = parse_obj_as(Milestone, dict(row))
+        milestone = Milestone.model_validate(dict(row))
     return milestone
 
 @router.put("/{milestone_id}", response_model=Milestone)
@@ -79,7 +68,7 @@ async def update_milestone(
         WHERE id = $3;
         ''', milestone.name, milestone.status, milestone_id)
         row = await conn.fetchrow('SELECT * FROM milestones WHERE id = $1;', milestone_id)
-        milestone = parse_obj_as(Milestone, dict(row))
+        milestone = Milestone.model_validate(dict(row))
     return milestone
 
 @router.delete("/{milestone_id}")
@@ -89,7 +78,7 @@ async def delete_milestone(milestone_id: int, pool = Depends(get_db_connection_p
         row = await conn.fetchrow('SELECT * FROM milestones WHERE id = $1;', milestone_id)
         if row is None:
             raise HTTPException(status_code=404, detail=f'A milestone with an id of {milestone_id} was not found.')
-        milestone = parse_obj_as(Milestone, dict(row))
+        milestone = Milestone.model_validate(dict(row))
 
         await conn.execute('DELETE FROM milestones WHERE id = $1;', milestone_id)
     return milestone
@@ -1,8 +1,8 @@
-from app.lifespan_manager import get_db_connection_pool, get_storage_service, get_azure_doc_intelligence_service
+from app.functions.list_queries import build_sort_lut, parse_sortby, fetch_list
+from app.lifespan_manager import clear_response_cache, get_db_connection_pool, get_storage_service, get_azure_doc_intelligence_service
 from app.models import Sow, SowEdit, SowChunk, ListResponse, SowAnalyzeResult
 from fastapi import APIRouter, Depends, HTTPException, File, UploadFile, Form
 from datetime import datetime
-from pydantic import parse_obj_as
 import json
 import traceback
 
@@ -15,31 +15,20 @@ router = APIRouter(
 )
 
 
+# Accepted sortby values for the list of SOWs, mapped to their (column, direction)
+SOW_SORT_LUT = build_sort_lut({"id", "number", "vendor_id", "start_date", "end_date", "budget"})
+
 @router.get("/", response_model=ListResponse[Sow])
 async def list_sows(vendor_id: int = -1, skip: int = 0, limit: int = 10, sortby: str = None, pool = Depends(get_db_connection_pool)):
     """Retrieves a list of SOWs from the database."""
-    orderby = 'id'
-    if (sortby):
-        orderby = sortby
-    async with pool.acquire() as conn:
-       
-        if (limit < 0):
-            if(vendor_id > 0):
-                rows = await conn.fetch('SELECT * FROM sows WHERE vendor_id = $1 ORDER BY $2;', vendor_id, orderby)
-            else:
-                rows = await conn.fetch('SELECT * FROM sows ORDER BY $1;', orderby)
-        else:
-            if(vendor_id > 0):
-                rows = await conn.fetch('SELECT * FROM sows WHERE vendor_id = $1 ORDER BY $2 LIMIT $3 OFFSET $4;', vendor_id, orderby, limit, skip)
-            else:
-                rows = await conn.fetch('SELECT * FROM sows ORDER BY $1 LIMIT $2 OFFSET $3;', orderby, limit, skip)
-
-        sows = parse_obj_as(list[Sow], [dict(row) for row in rows])
+    col, dir = parse_sortby(sortby, SOW_SORT_LUT)
 
+    async with pool.acquire() as conn:
         if (vendor_id > 0):
-            total = await conn.fetchval('SELECT COUNT(*) FROM sows WHERE vendor_id = $1;', vendor_id)
+            records, total = await fetch_list(conn, 'sows', col, dir, skip, limit, 'vendor_id = $1', vendor_id)
         else:
-            total = await conn.fetchval('SELECT COUNT(*) FROM sows;')
+            records, total = await fetch_list(conn, 'sows', col, dir, skip, limit)
+        sows = [Sow.model_validate(dict(record)) for record in records]
 
     if (limit < 0):
         limit = total
@@ -54,7 +43,7 @@ async def get_by_id(sow_id: int, pool = Depends(get_db_connection_pool)):
         row = await conn.fetchrow('SELECT * FROM sows WHERE id = $1;', sow_id)
         if row is None:
             raise HTTPException(status_code=404, detail=f'A SOW with an id of {sow_id} was not found.')
-        sow = parse_obj_as(Sow, dict(row))
+        sow = Sow.model_validate(dict(row))
     return sow
 
 
@@ -130,7 +119,7 @@ async def analyze_sow(
             if row is None:
                 raise HTTPException(status_code=500, detail=f'An error occurred while creating the SOW.')
 
-            sow = parse_obj_as(Sow, dict(row))
+            sow = Sow.model_validate(dict(row))
 
 
             # Save the text chunks for the SOW
@@ -140,6 +129,9 @@ async def analyze_sow(
                     INSERT INTO sow_chunks (sow_id, heading, content, page_number) VALUES ($1, $2, $3, $4);
                 ''', sow.id, chunk.heading, chunk.content, chunk.page_number)
 
+        # Invalidate cached invoice responses, which include the SOW number
+        await clear_response_cache("invoices")
+
         return SowAnalyzeResult(hasError=False, error=None, message="SOW analyzed successfully.", sow=sow)
 
     except Exception as e:
@@ -172,7 +164,10 @@ async def update_sow(sow_id: int, sow_update: SowEdit, pool = Depends(get_db_con
             sow.number, sow.start_date, sow.end_date, sow.budget, sow.vendor_id, sow_id)
         if row is None:
             raise HTTPException(status_code=404, detail=f'A SOW with an id of {sow_id} was not found.')
-        updated_sow = parse_obj_as(Sow, dict(row))
+        updated_sow = Sow.model_validate(dict(row))
+
+    # Invalidate cached invoice responses, which include the SOW number
+    await clear_response_cache("invoices")
     return updated_sow
 
 @router.delete("/{id}", response_model=Sow)
@@ -182,13 +177,16 @@ async def delete_sow(id: int, pool = Depends(get_db_connection_pool), storage_se
         row = await conn.fetchrow('SELECT * FROM sows WHERE id = $1;', id)
         if row is None:
             raise HTTPException(status_code=404, detail=f'A sow with an id of {id} was not found.')
-        sow = parse_obj_as(Sow, dict(row))
+        sow = Sow.model_validate(dict(row))
 
         # Delete the document from Azure Blob Storage
         await storage_service.delete_document(sow.document)
 
         # Delete the SOW
         await conn.execute('DELETE FROM sows WHERE id = $1;', id)
+
+    # Invalidate cached invoice responses, since the SOW's invoices are deleted along with it
+    await clear_response_cache("invoices")
     return sow
 
 
@@ -197,5 +195,5 @@ async def get_sow_chunks(sow_id: int, pool = Depends(get_db_connection_pool)):
     """Retrieves a list of SOW chunks from the database."""
     async with pool.acquire() as conn:
         rows = await conn.fetch('SELECT * FROM sow_chunks WHERE sow_id = $1 ORDER BY page_number, heading;', sow_id)
-        sow_chunks = parse_obj_as(list[SowChunk], [dict(row) for row in rows])
+        sow_chunks = [SowChunk.model_validate(dict(row)) for row in rows]
     return ListResponse[SowChunk](data=sow_chunks, total=len(sow_chunks), skip=0, limit=len(sow_chunks))
\ No newline at end of file
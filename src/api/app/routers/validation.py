@@ -6,7 +6,6 @@ from app.lifespan_manager import get_chat_client, get_db_connection_pool, get_pr
 from app.models import Deliverable, InvoiceLineItem, InvoiceValidationResult, ListResponse, SowValidationResult, Vendor
 from fastapi import APIRouter, Depends, HTTPException
 from app.models.validation import InvoiceModel, SowModel, MilestoneModel
-from pydantic import parse_obj_as
 
 # Initialize the router
 router = APIRouter(
@@ -21,7 +20,7 @@ async def list_invoice_validations(id: int, pool = Depends(get_db_connection_poo
     """Retrieves a list of validation results for an Invoice from the database."""
     async with pool.acquire() as conn:
         rows = await conn.fetch('SELECT * FROM invoice_validation_results WHERE invoice_id = $1 ORDER BY datestamp DESC;', id)
-        validations = parse_obj_as(list[InvoiceValidationResult], [dict(row) for row in rows])
+        validations = [InvoiceValidationResult.model_validate(dict(row)) for row in rows]
     return ListResponse(data=validations, total = len(validations), skip = 0, limit = len(validations))
 
 @router.post('/invoice/{id}', response_model = str)
@@ -86,28 +85,28 @@ async def validate_invoice(id: int):
         row = await conn.fetchrow('SELECT * FROM invoices WHERE id = $1;', id)
         if row is None:
             raise HTTPException(status_code=404, detail=f'An invoice with an id of {id} was not found.')
-        invoice = parse_obj_as(InvoiceModel, dict(row))
+        invoice = InvoiceModel.model_validate(dict(row))
 
         # Get the vendor name
         vendor_row = await conn.fetchrow('SELECT * FROM vendors WHERE id = $1;', invoice.vendor_id)
-        invoice.vendor = parse_obj_as(Vendor, dict(vendor_row))
+        invoice.vendor = Vendor.model_validate(dict(vendor_row))
 
         # Get the invoice line items
         line_item_rows = await conn.fetch('SELECT * FROM invoice_line_items WHERE invoice_id = $1;', id)
-        invoice.line_items = [parse_obj_as(InvoiceLineItem, dict(row)) for row in line_item_rows]
+        invoice.line_items = [InvoiceLineItem.model_validate(dict(row)) for row in line_item_rows]
 
         # Get the SOW
         sow_row = await conn.fetchrow('SELECT * FROM sows WHERE id = $1;', invoice.sow_id)
-        sow = parse_obj_as(SowModel, dict(sow_row))
+        sow = SowModel.model_validate(dict(sow_row))
 
         # Get the milestones
         milestone_rows = await conn.fetch('SELECT * FROM milestones WHERE sow_id = $1;', invoice.sow_id)
-        sow.milestones = [parse_obj_as(MilestoneModel, dict(row)) for row in milestone_rows]
+        sow.milestones = [MilestoneModel.model_validate(dict(row)) for row in milestone_rows]
 
         # Get the deliverables for each milestone
         for milestone in sow.milestones:
             deliverable_rows = await conn.fetch('SELECT * FROM deliverables WHERE milestone_id = $1;', milestone.id)
-            milestone.deliverables = parse_obj_as(list[Deliverable], [dict(row) for row in deliverable_rows])
+            milestone.deliverables = [Deliverable.model_validate(dict(row)) for row in deliverable_rows]
 
     return invoice, sow
 
@@ -116,7 +115,7 @@ async def list_sow_validations(id: int, pool = Depends(get_db_connection_pool)):
     """Retrieves a list of validation results for a SOW from the database."""
     async with pool.acquire() as conn:
         rows = await conn.fetch('SELECT * FROM sow_validation_results WHERE sow_id = $1 ORDER BY datestamp DESC;', id)
-        validations = parse_obj_as(list[SowValidationResult], [dict(row) for row in rows])
+        validations = [SowValidationResult.model_validate(dict(row)) for row in rows]
     return ListResponse(data=validations, total = len(validations), skip = 0, limit = len(validations))
 
 @router.post('/sow/{id}', response_model = str)
@@ -177,15 +176,15 @@ async def validate_sow(id: int):
         row = await conn.fetchrow('SELECT * FROM sows WHERE id = $1;', id)
         if row is None:
             raise HTTPException(status_code=404, detail=f'A SOW with an id of {id} was not found.')
-        sow = parse_obj_as(SowModel, dict(row))
+        sow = SowModel.model_validate(dict(row))
 
         # Get the milestones
         milestone_rows = await conn.fetch('SELECT * FROM milestones WHERE sow_id = $1;', id)
-        sow.milestones = [parse_obj_as(MilestoneModel, dict(row)) for row in milestone_rows]
+        sow.milestones = [MilestoneModel.model_validate(dict(row)) for row in milestone_rows]
 
         # Get the deliverables for each milestone
         for milestone in sow.milestones:
             deliverable_rows = await conn.fetch('SELECT * FROM deliverables WHERE milestone_id = $1;', milestone.id)
-            milestone.deliverables = parse_obj_as(list[Deliverable], [dict(row) for row in deliverable_rows])
+            milestone.deliverables = [Deliverable.model_validate(dict(row)) for row in deliverable_rows]
 
     return sow
@@ -1,7 +1,7 @@
+from app.functions.list_queries import build_sort_lut, parse_sortby, fetch_list
 from app.lifespan_manager import get_db_connection_pool
 from app.models import Vendor, ListResponse
 from fastapi import APIRouter, Depends, HTTPException
-from pydantic import parse_obj_as
 
 # Initialize the router
 router = APIRouter(
@@ -11,27 +11,28 @@ router = APIRouter(
     responses = {404: {"description": "Not found"}}
 )
 
-@router.get('/', response_model = ListResponse[Vendor])
-async def list_vendors(skip: int = 0, limit: int = 10, sortby: str = None, pool = Depends(get_db_connection_pool)):
-    """Retrieves a list of vendors from the database."""
-    async with pool.acquire() as conn:
-        orderby = 'id'
-        if (sortby):
-            orderby = sortby
+# Accepted sortby values for the list of vendors, mapped to their (column, direction)
+VENDOR_SORT_LUT = build_sort_lut({"id", "name", "address", "contact_name", "contact_email", "contact_phone", "website", "type"})
 
-        if limit == -1:
-            rows = await conn.fetch('SELECT * FROM vendors ORDER BY $1;', orderby)
-        else:
-            rows = await conn.fetch('SELECT * FROM vendors ORDER BY $1 LIMIT $2 OFFSET $3;', orderby, limit, skip)
+# Full-text search filter; the tsvector expression must match the idx_vendors_search GIN index expression exactly for the index to be used
+VENDOR_SEARCH_SQL = "to_tsvector('simple', name || ' ' || address || ' ' || contact_name || ' ' || contact_email || ' ' || type) @@ plainto_tsquery('simple', $1)"
 
-        vendors = parse_obj_as(list[Vendor], [dict(row) for row in rows])
+@router.get('/', response_model = ListResponse[Vendor])
+async def list_vendors(skip: int = 0, limit: int = 10, sortby: str = None, search: str = None, pool = Depends(get_db_connection_pool)):
+    """Retrieves a list of vendors from the database, optionally filtered by a full-text search."""
+    col, dir = parse_sortby(sortby, VENDOR_SORT_LUT)
 
-        total = await conn.fetchval('SELECT COUNT(*) FROM vendors;')
+    async with pool.acquire() as conn:
+        if search:
+            records, total = await fetch_list(conn, 'vendors', col, dir, skip, limit, VENDOR_SEARCH_SQL, search)
+        else:
+            records, total = await fetch_list(conn, 'vendors', col, dir, skip, limit)
+        vendors = [Vendor.model_validate(dict(record)) for record in records]
 
-    if (limit == -1):
+    if (limit < 0):
         limit = total
 
-    return ListResponse[Vendor](data = vendors, total = len(vendors), skip = 0, limit = len(vendors))
+    return ListResponse[Vendor](data = vendors, total = total, skip = skip, limit = limit)
 
 @router.get('/{id:int}', response_model = Vendor)
 async def get_by_id(id: int, pool = Depends(get_db_connection_pool)):
@@ -40,7 +41,7 @@ async def get_by_id(id: int, pool = Depends(get_db_connection_pool)):
         row = await conn.fetchrow('SELECT * FROM vendors WHERE id = $1;', id)
         if row is None:
             raise HTTPException(status_code=404, detail=f'A vendor with an id of {id} was not found.')
-        vendor = parse_obj_as(Vendor, dict(row))
+        vendor = Vendor.model_validate(dict(row))
     return vendor
 
 @router.get('/type/{type}', response_model = list[Vendor])
@@ -50,5 +51,5 @@ async def get_by_type(type: str, pool = Depends(get_db_connection_pool)):
         rows = await conn.fetch('SELECT * FROM vendors WHERE LOWER(type) = $1;', type.lower())
         if not rows or len(rows) == 0:
             raise HTTPException(status_code=404, detail=f'No vendors with a type of "{type}" were found.')
-        vendors = parse_obj_as(list[Vendor], [dict(row) for row in rows])
+        vendors = [Vendor.model_validate(dict(row)) for row in rows]
     return vendors
@@ -24,6 +24,13 @@ class ConfigService:
         await self.client.close()
 
     async def __get_setting(self, key: str) -> str:
+        value = await self.__get_optional_setting(key)
+        if value is None:
+            raise Exception(f"Setting '{key}' not found in Azure App Configuration.")
+        return value
+
+    async def __get_optional_setting(self, key: str) -> str:
+        """Returns the value of a setting, or None if the setting does not exist. Any other error is raised."""
         try:
             setting = await self.client.get_configuration_setting(key=key)
             
@@ -41,7 +48,7 @@ class ConfigService:
 
             return value
         except ResourceNotFoundError:
-            raise Exception(f"Setting '{key}' not found in Azure App Configuration.")
+            return None
 
     async def get_openai_endpoint(self) -> str:
         return await self.__get_setting("openai-endpoint")
@@ -52,6 +59,11 @@ class ConfigService:
     async def get_postgresql_database_name(self) -> str:
         return await self.__get_setting("postgresql-database")
 
+    async def get_postgresql_port(self) -> int:
+        """Returns the PostgreSQL port; 6432 when connecting through the built-in PgBouncer."""
+        port = await self.__get_optional_setting("postgresql-port")
+        return int(port) if port else 5432
+
     async def get_storage_account(self) -> str:
         return await self.__get_setting("storage-account")
 
@@ -61,6 +73,10 @@ class ConfigService:
     async def get_doc_intelligence_endpoint(self) -> str:
         return await self.__get_setting("doc-intelligence-endpoint")
 
+    async def get_redis_url(self) -> str:
+        """Returns the Redis connection URL used for response caching, or None if Redis is not configured."""
+        return await self.__get_optional_setting("redis-url")
+
     def get_document_container_name(self) -> str:
         return "documents"
 
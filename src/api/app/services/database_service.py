@@ -6,12 +6,16 @@ import asyncio
 import jwt
 import os
 
+# Port of the built-in PgBouncer connection pooler on Azure Database for PostgreSQL flexible server
+PGBOUNCER_PORT = 6432
+
 class DatabaseService:
     """Class to manage the connection to the Azure Database for PostgreSQL server."""
-    def __init__(self, credential: DefaultAzureCredential, host_name: str, database_name: str):
+    def __init__(self, credential: DefaultAzureCredential, host_name: str, database_name: str, port: int = 5432):
         self.credential = credential
         self.host_name = host_name
         self.database_name = database_name
+        self.port = port
         self.connection_pool = None
         self.connection_pool_lock = asyncio.Lock()
 
@@ -35,6 +39,11 @@ class DatabaseService:
             # use lock to make sure this is thread safe
             async with self.connection_pool_lock:
 
+                # re-check once the lock is held, since another request may have already created the pool
+                is_token_expired = await self.__is_azure_token_expired()
+                if self.connection_pool is not None and not self.connection_pool._closed and not is_token_expired:
+                    return self.connection_pool
+
                 if (is_token_expired and self.connection_pool is not None and not self.connection_pool._closed):
                     # Be sure to close the connection pool before creating an new one
                     await self.close()
@@ -42,8 +51,26 @@ class DatabaseService:
                 # get database connection string
                 connection_uri = await self.__get_connection_uri()
 
-                # create database connection pool
-                self.connection_pool = await asyncpg.create_pool(dsn=connection_uri, min_size=1, max_size=150)
+                # create database connection pool, shared by all requests in this process
+                if self.port == PGBOUNCER_PORT:
+                    # PgBouncer multiplexes every worker's connections onto a shared set of server connections,
+                    # so each worker keeps a small pool. Transaction pooling does not support prepared statements
+                    # being reused across transactions, so asyncpg's statement cache must be disabled.
+                    self.connection_pool = await asyncpg.create_pool(
+                        dsn=connection_uri,
+                        min_size=2,
+                        max_size=10,
+                        max_inactive_connection_lifetime=300,
+                        statement_cache_size=0
+                    )
+                else:
+                    self.connection_pool = await asyncpg.create_pool(
+                        dsn=connection_uri,
+                        min_size=10,
+                        max_size=50,
+                        max_inactive_connection_lifetime=300,
+                        statement_cache_size=1024
+                    )
 
         # return the connection pool
         return self.connection_pool
@@ -83,6 +110,6 @@ class DatabaseService:
         username = await self.__get_username(token)
 
         # create the full connection string
-        db_uri = f"postgresql://{urllib.parse.quote_plus(username)}:{password}@{self.host_name}:5432/{self.database_name}?sslmode={sslmode}"
+        db_uri = f"postgresql://{urllib.parse.quote_plus(username)}:{password}@{self.host_name}:{self.port}/{self.database_name}?sslmode={sslmode}"
 
         return db_uri
@@ -0,0 +1,103 @@
+import datetime
+import decimal
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from fastapi.testclient import TestClient
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.inmemory import InMemoryBackend
+from app.lifespan_manager import get_db_connection_pool, request_key_builder
+from app.main import app
+
+INVOICE_ROW = {
+    'id': 2,
+    'vendor_id': 1,
+    'sow_id': 1,
+    'number': 'INV-2',
+    'amount': decimal.Decimal('15600.00'),
+    'invoice_date': datetime.date(2024, 12, 8),
+    'payment_status': 'Paid',
+    'document': '1/invoice/2.pdf',
+    'content': 'Invoice content',
+    'metadata': '{}'
+}
+
+class FakeConnection:
+    """Stands in for an asyncpg connection, returning a single invoice row."""
+    async def fetchrow(self, sql, *args):
+        # Reads pass the invoice id first, and updates pass it last
+        return INVOICE_ROW if INVOICE_ROW['id'] in (args[0], args[-1]) else None
+
+class FakeAcquire:
+    async def __aenter__(self):
+        return FakeConnection()
+
+    async def __aexit__(self, *args):
+        return False
+
+class FakePool:
+    def acquire(self):
+        return FakeAcquire()
+
+async def get_fake_pool():
+    return FakePool()
+
+class UnreachableBackend(InMemoryBackend):
+    """Stands in for a cache that cannot be reached when clearing it."""
+    async def clear(self, namespace = None, key = None):
+        raise ConnectionError('Cache is unreachable.')
+
+class TestGetInvoiceById(unittest.TestCase):
+    def setUp(self):
+        FastAPICache.init(InMemoryBackend(), prefix="test", key_builder=request_key_builder)
+        app.dependency_overrides[get_db_connection_pool] = get_fake_pool
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        app.dependency_overrides.clear()
+        FastAPICache.reset()
+
+    def test_cached_invoice_matches_uncached_invoice(self):
+        first = self.client.get('/invoices/2')
+        second = self.client.get('/invoices/2')
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.headers['X-FastAPI-Cache'], 'HIT')
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(first.json()['metadata'], {})
+
+    def test_missing_invoice_is_not_found(self):
+        self.assertEqual(self.client.get('/invoices/3').status_code, 404)
+        self.assertEqual(self.client.get('/invoices/3').status_code, 404)
+
+class TestUpdateInvoice(unittest.TestCase):
+    def setUp(self):
+        FastAPICache.init(UnreachableBackend(), prefix="test", key_builder=request_key_builder)
+        app.dependency_overrides[get_db_connection_pool] = get_fake_pool
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        app.dependency_overrides.clear()
+        FastAPICache.reset()
+
+    def test_update_succeeds_when_cache_cannot_be_cleared(self):
+        invoice = {
+            'vendor_id': 1,
+            'sow_id': 1,
+            'number': 'INV-2',
+            'amount': 15600.0,
+            'invoice_date': '2024-12-08',
+            'payment_status': 'Paid'
+        }
+        with self.assertLogs('app.lifespan_manager', level='WARNING'):
+            response = self.client.put('/invoices/2', json=invoice)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['id'], 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,10 +1,10 @@
 const RESTHelper = {
     get: async (url) => {
         const tryGet = async () => {
+            // GET requests have no body, so only safelisted headers are sent, avoiding a CORS preflight request
             const response = await fetch(url, {
                 headers: {
                     'Accept': 'application/json',
-                    'Content-Type': 'application/json',
                 }
             });
             if (!response.ok) {